@@ -0,0 +1,337 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from core.models import BenchmarkResult, BenchmarkRun, CapturedRequest, ExecutionResult
+from core.replay import Replayer
+from core.chaos import ChaosEngine
+from core.mutation import Mutator
+from rich.console import Console
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+console = Console()
+
+BENCH_HOST = "127.0.0.1"
+BENCH_PORT = 8998
+
+
+# ----------------------------
+# Stand-in target
+# ----------------------------
+
+async def _handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """
+    Minimal keep-alive HTTP/1.1 responder. It never sleeps, so any
+    throughput ceiling observed in a benchmark belongs to the client.
+    """
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line[:15].lower() == b"content-length:":
+                    length = int(line[15:].strip())
+            if length:
+                await reader.readexactly(length)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nContent-Type: text/plain\r\n\r\nOK")
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _serve(host: str, port: int, ready=None):
+    server = await asyncio.start_server(_handle_connection, host, port, backlog=1024)
+    if ready is not None:
+        ready.set()
+    async with server:
+        await server.serve_forever()
+
+
+def run_target(host: str = BENCH_HOST, port: int = BENCH_PORT, ready=None):
+    """
+    Run the stand-in target until the process is terminated. `ready` (a
+    multiprocessing.Event) is set once the port is bound; if binding fails
+    the process exits without setting it.
+    """
+    try:
+        asyncio.run(_serve(host, port, ready))
+    except OSError as e:
+        console.print(f"[red]Benchmark target failed to bind {host}:{port}:[/red] {e}")
+        sys.exit(1)
+
+
+def _wait_for_target(target: multiprocessing.Process, ready, host: str, port: int, timeout: float = 5.0):
+    # Probing the port isn't enough: if something else already listens
+    # there, the benchmark would silently measure that server instead
+    deadline = time.monotonic() + timeout
+    while not ready.wait(0.05):
+        if not target.is_alive():
+            raise RuntimeError(f"Benchmark target exited before binding {host}:{port} (is the port in use?)")
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Benchmark target did not start on {host}:{port}")
+
+
+# ----------------------------
+# Measurement helpers
+# ----------------------------
+
+def _cpu_seconds() -> float:
+    # process_time covers this process only; the target runs in a child
+    return time.process_time()
+
+
+def _peak_rss_mb() -> Optional[float]:
+    # ru_maxrss is a lifetime peak, which is why each scenario runs in its
+    # own process (see _run_scenario)
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes up from a fixed-interval sleep."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - start - self.interval) * 1000)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {"mean": 0.0, "p99": 0.0, "max": 0.0}
+        ordered = sorted(self.samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return {
+            "mean": sum(ordered) / len(ordered),
+            "p99": p99,
+            "max": ordered[-1],
+        }
+
+
+# ----------------------------
+# Scenarios
+# ----------------------------
+
+def _request(url: str, method: str = "GET", body=None) -> CapturedRequest:
+    return CapturedRequest(
+        request_id=str(uuid.uuid4()),
+        url=url,
+        method=method,
+        headers={"User-Agent": "FORTEX-Bench"},
+        body=body,
+    )
+
+
+async def _scenario_baseline(replayer: Replayer, url: str, requests: int, concurrency: int) -> List[ExecutionResult]:
+    """Fan out independent baseline requests with bounded parallelism."""
+    batch = [_request(url) for _ in range(requests)]
+    return await replayer.execute_batch(batch, parallelism=concurrency)
+
+
+async def _scenario_race(replayer: Replayer, url: str, requests: int) -> List[ExecutionResult]:
+    """Repeated race-condition bursts (ChaosEngine's fixed width), as `attack --scenario race` fires them."""
+    chaos = ChaosEngine(replayer)
+    req = _request(url, "POST", {"id": 1, "amount": 10})
+    results = []
+    while len(results) < requests:
+        results.extend(await chaos.execute_scenario("race_condition", req))
+    return results
+
+
+async def _scenario_mutation(replayer: Replayer, url: str, requests: int) -> List[ExecutionResult]:
+    """Generate and replay mutants sequentially, as the attack loop does."""
+    req = _request(url, "POST", {"id": 1, "name": "fortex", "amount": 10, "note": "bench"})
+    results = []
+    while len(results) < requests:
+        for m in Mutator.mutate(req):
+            results.append(await replayer.execute(m, f"mutation_{m.request_id}"))
+    return results
+
+
+async def _scenario_load(replayer: Replayer, url: str, requests: int, rate: float = 500.0) -> List[ExecutionResult]:
+    """Open-loop load: schedule requests at a fixed rate regardless of latency."""
+    req = _request(url)
+    interval = 1.0 / rate
+    tasks = []
+    start = time.perf_counter()
+    for i in range(requests):
+        delay = start + i * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(replayer.execute(req, "load")))
+    return await asyncio.gather(*tasks)
+
+
+SCENARIOS: Dict[str, Callable[..., Awaitable[List[ExecutionResult]]]] = {
+    "baseline": _scenario_baseline,
+    "race": _scenario_race,
+    "mutation": _scenario_mutation,
+    "load": _scenario_load,
+}
+
+
+# ----------------------------
+# Runner
+# ----------------------------
+
+async def _run_one(name: str, url: str, requests: int, concurrency: int, rate: float) -> BenchmarkRun:
+    replayer = Replayer()
+    monitor = LoopLagMonitor()
+
+    # Only baseline has a parallelism knob; the other scenarios reproduce
+    # how `attack` fires requests, and load is paced by rate instead
+    kwargs = {"baseline": {"concurrency": concurrency}, "load": {"rate": rate}}.get(name, {})
+
+    # Warm up the connection pool so the first scenario isn't penalised
+    await replayer.execute(_request(url), "warmup")
+
+    monitor.start()
+    cpu_start = _cpu_seconds()
+    wall_start = time.perf_counter()
+    results = await SCENARIOS[name](replayer, url, requests, **kwargs)
+    wall = time.perf_counter() - wall_start
+    cpu = _cpu_seconds() - cpu_start
+    await monitor.stop()
+    await replayer.close()
+
+    # Failed requests (e.g. connection errors) are cheap and would inflate
+    # throughput, so only successful ones count
+    completed = sum(1 for r in results if r.status == "SUCCESS")
+
+    lag = monitor.summary()
+    return BenchmarkRun(
+        scenario=name,
+        requests=completed,
+        errors=len(results) - completed,
+        wall_seconds=wall,
+        requests_per_second=completed / wall if wall else 0.0,
+        cpu_ms_per_request=(cpu * 1000) / completed if completed else 0.0,
+        peak_rss_mb=_peak_rss_mb(),
+        loop_lag_mean_ms=lag["mean"],
+        loop_lag_p99_ms=lag["p99"],
+        loop_lag_max_ms=lag["max"],
+    )
+
+
+def _run_scenario(name: str, url: str, requests: int, concurrency: int, rate: float) -> BenchmarkRun:
+    """Pool entry point: one scenario in a fresh worker process."""
+    return asyncio.run(_run_one(name, url, requests, concurrency, rate))
+
+
+def run_benchmarks(
+    scenarios: List[str],
+    requests: int = 2000,
+    concurrency: int = 50,
+    rate: float = 500.0,
+    port: int = BENCH_PORT,
+) -> BenchmarkResult:
+    """
+    Start the stand-in target in a child process and run each scenario
+    against it, measuring only the FORTEX client process. Each scenario
+    runs in its own worker process, so its peak RSS isn't inflated by the
+    scenarios before it. `concurrency` applies to the baseline scenario
+    only, `rate` to load only.
+    """
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown scenario(s): {', '.join(unknown)}")
+    if requests < 1:
+        raise ValueError("requests must be at least 1")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if rate <= 0:
+        raise ValueError("rate must be greater than 0")
+
+    ready = multiprocessing.Event()
+    target = multiprocessing.Process(target=run_target, args=(BENCH_HOST, port, ready), daemon=True)
+    target.start()
+    try:
+        _wait_for_target(target, ready, BENCH_HOST, port)
+        url = f"http://{BENCH_HOST}:{port}/bench"
+
+        runs = []
+        for name in scenarios:
+            console.print(f"[yellow]Benchmarking {name}...[/yellow]")
+            with multiprocessing.Pool(1) as pool:
+                runs.append(pool.apply(_run_scenario, (name, url, requests, concurrency, rate)))
+    finally:
+        target.terminate()
+        target.join()
+
+    return BenchmarkResult(
+        python=sys.version.split()[0],
+        platform=sys.platform,
+        cpu_count=os.cpu_count() or 1,
+        runs=runs,
+    )
+
+
+def print_benchmarks(result: BenchmarkResult):
+    from rich.table import Table
+
+    table = Table(title="FORTEX Client Overhead")
+    table.add_column("Scenario", style="cyan")
+    table.add_column("Requests", justify="right")
+    table.add_column("Errors", justify="right", style="red")
+    table.add_column("Req/s", justify="right", style="green")
+    table.add_column("CPU ms/req", justify="right")
+    table.add_column("Peak RSS (MB)", justify="right")
+    table.add_column("Loop lag p99/max (ms)", justify="right", style="magenta")
+
+    for run in result.runs:
+        rss = f"{run.peak_rss_mb:.1f}" if run.peak_rss_mb is not None else "N/A"
+        table.add_row(
+            run.scenario,
+            str(run.requests),
+            str(run.errors),
+            f"{run.requests_per_second:.0f}",
+            f"{run.cpu_ms_per_request:.3f}",
+            rss,
+            f"{run.loop_lag_p99_ms:.2f} / {run.loop_lag_max_ms:.2f}",
+        )
+
+    console.print(table)
+
+
+def save_benchmarks(result: BenchmarkResult, filename: str):
+    """Save benchmark results as JSON for comparison across versions."""
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(filename, "w") as f:
+        json.dump(result.model_dump(mode='json'), f, indent=2)
+
+    console.print(f"[bold green]Benchmark saved to {filename}[/bold green]")
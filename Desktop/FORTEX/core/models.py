@@ -50,3 +50,24 @@ class CrashSnapshot(BaseModel):
     results: List[ExecutionResult]
     timestamp: datetime = Field(default_factory=datetime.now)
     analysis: Optional[str] = None
+
+class BenchmarkRun(BaseModel):
+    """Client-side cost of one benchmark scenario"""
+    scenario: str
+    requests: int  # successful requests only
+    errors: int = 0
+    wall_seconds: float
+    requests_per_second: float
+    cpu_ms_per_request: float
+    peak_rss_mb: Optional[float] = None  # peak of a process that ran only this scenario
+    loop_lag_mean_ms: float = 0.0
+    loop_lag_p99_ms: float = 0.0
+    loop_lag_max_ms: float = 0.0
+
+class BenchmarkResult(BaseModel):
+    """A full self-benchmark, saved for regression tracking"""
+    python: str
+    platform: str
+    cpu_count: int
+    runs: List[BenchmarkRun]
+    timestamp: datetime = Field(default_factory=datetime.now)
@@ -4,6 +4,8 @@ from typing import Optional
 from rich.console import Console
 from rich.panel import Panel
 
+from core.bench import BENCH_PORT
+
 app = typer.Typer(help="FORTEX: Autonomous Chaos Testing System")
 console = Console()
 
@@ -161,6 +163,42 @@ def scan(url: str, depth: int = 1, headless: bool = True):
         results = asyncio.run(run_scan())
         _analyze_and_report(results)
 
+@app.command()
+def bench(
+    scenario: str = "all",
+    requests: int = 2000,
+    concurrency: int = 50,
+    rate: float = 500.0,
+    port: int = BENCH_PORT,
+    output: Optional[str] = None,
+):
+    """
+    Benchmark FORTEX's own client overhead against a fast local stand-in target.
+
+    --concurrency only applies to the baseline scenario and --rate only to
+    load; race and mutation fire requests exactly as `attack` does.
+    """
+    from core.bench import SCENARIOS, run_benchmarks, print_benchmarks, save_benchmarks
+
+    scenarios = list(SCENARIOS) if scenario == "all" else [s.strip() for s in scenario.split(",") if s.strip()]
+
+    console.print(f"[bold green]Benchmarking client overhead: {', '.join(scenarios)} ({requests} requests each)[/bold green]")
+
+    try:
+        result = run_benchmarks(scenarios, requests=requests, concurrency=concurrency, rate=rate, port=port)
+    except (ValueError, RuntimeError) as e:
+        console.print(f"[bold red]Benchmark failed:[/bold red] {e}")
+        raise typer.Exit(code=1)
+    print_benchmarks(result)
+
+    if output:
+        save_benchmarks(result, output)
+
+    failed = [run.scenario for run in result.runs if run.requests == 0]
+    if failed:
+        console.print(f"[bold red]No successful requests in: {', '.join(failed)}; results are not meaningful.[/bold red]")
+        raise typer.Exit(code=1)
+
 
 if __name__ == "__main__":
     app()
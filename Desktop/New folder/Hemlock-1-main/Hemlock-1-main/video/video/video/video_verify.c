@@ -1,6 +1,7 @@
 #include "../common/hash_utils.h"
 #include "../key_manager/include/key_manager.h"
 
+#include <stdint.h>
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
@@ -10,6 +11,12 @@
 #define CHANNELS 3
 #define FRAME_SIZE (WIDTH * HEIGHT * CHANNELS)
 
+// video_chain.bin header (same layout as video_py/video_utils.py):
+// "HCHN", version byte, 3 padding bytes, little-endian u64 frame count
+#define CHAIN_MAGIC "HCHN"
+#define CHAIN_VERSION 2
+#define CHAIN_HEADER_SIZE 16
+
 int verify_video(const char *video_path) {
   system("rm -rf frames && mkdir frames");
 
@@ -32,6 +39,22 @@ int verify_video(const char *video_path) {
     return -1;
   }
 
+  // Headered chains start with the magic; older ones are bare hashes
+  uint64_t chain_frames = UINT64_MAX;
+  uint8_t header[CHAIN_HEADER_SIZE];
+  if (fread(header, 1, CHAIN_HEADER_SIZE, chain) == CHAIN_HEADER_SIZE &&
+      memcmp(header, CHAIN_MAGIC, 4) == 0) {
+    if (header[4] != CHAIN_VERSION) {
+      printf("✘ Unsupported hash chain version %d\n", header[4]);
+      return -1;
+    }
+    chain_frames = 0;
+    for (int i = 0; i < 8; i++)
+      chain_frames |= (uint64_t)header[8 + i] << (8 * i);
+  } else {
+    rewind(chain);
+  }
+
   uint8_t frame[FRAME_SIZE];
   uint8_t prev_hash[32] = {0};
   uint8_t expected[32], computed[32];
@@ -39,7 +62,8 @@ int verify_video(const char *video_path) {
   int frame_id = 0;
 
   while (fread(frame, 1, FRAME_SIZE, f) == FRAME_SIZE) {
-    if (fread(expected, 1, 32, chain) != 32) {
+    if ((uint64_t)frame_id >= chain_frames ||
+        fread(expected, 1, 32, chain) != 32) {
       printf("✘ Chain length mismatch\n");
       return -1;
     }
@@ -2,6 +2,7 @@
 #include "../common/hash_utils.h"
 #include "../key_manager/include/key_manager.h"
 
+#include <stdint.h>
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
@@ -11,6 +12,21 @@
 #define CHANNELS 3
 #define FRAME_SIZE (WIDTH * HEIGHT * CHANNELS)
 
+// video_chain.bin header (same layout as video_py/video_utils.py):
+// "HCHN", version byte, 3 padding bytes, little-endian u64 frame count
+#define CHAIN_MAGIC "HCHN"
+#define CHAIN_VERSION 2
+#define CHAIN_HEADER_SIZE 16
+
+static void write_chain_header(FILE *chain, uint64_t frame_count) {
+  uint8_t header[CHAIN_HEADER_SIZE] = {0};
+  memcpy(header, CHAIN_MAGIC, 4);
+  header[4] = CHAIN_VERSION;
+  for (int i = 0; i < 8; i++)
+    header[8 + i] = (uint8_t)(frame_count >> (8 * i));
+  fwrite(header, 1, CHAIN_HEADER_SIZE, chain);
+}
+
 int sign_video(const char *video_path) {
   system("rm -rf frames && mkdir frames");
 
@@ -33,16 +49,24 @@ int sign_video(const char *video_path) {
   if (!chain)
     return -1;
 
+  // Frame count is patched in once all hashes are written
+  write_chain_header(chain, 0);
+
   uint8_t frame[FRAME_SIZE];
   uint8_t prev_hash[32] = {0};
   uint8_t curr_hash[32];
+  uint64_t frame_count = 0;
 
   while (fread(frame, 1, FRAME_SIZE, f) == FRAME_SIZE) {
     sha256_chain(frame, FRAME_SIZE, prev_hash, curr_hash);
     fwrite(curr_hash, 1, 32, chain);
     memcpy(prev_hash, curr_hash, 32);
+    frame_count++;
   }
 
+  rewind(chain);
+  write_chain_header(chain, frame_count);
+
   fclose(f);
   fclose(chain);
 
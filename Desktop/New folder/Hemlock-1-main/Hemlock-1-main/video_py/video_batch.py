@@ -0,0 +1,157 @@
+import sys
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from video_verify import PUBLIC_KEY_PATH, load_public_key, verify_video
+
+VIDEO_EXTENSIONS = (".mp4", ".m4v", ".mov", ".mkv", ".avi", ".webm", ".ts")
+
+
+# ----------------------------
+# Job discovery
+# ----------------------------
+
+def provenance_dir_for(video_path: str) -> str:
+    """Per-video provenance directory: clip.mp4 -> clip_provenance/"""
+    return os.path.splitext(video_path)[0] + "_provenance"
+
+
+def load_jobs(source: str):
+    """
+    (video, provenance_dir) pairs from a directory of videos or a manifest.
+    Manifest lines are either JSON ({"video": ..., "provenance": ...}) or a
+    video path with an optional tab-separated provenance dir; relative paths
+    are resolved against the manifest's directory.
+    """
+    if os.path.isdir(source):
+        videos = sorted(
+            os.path.join(source, name) for name in os.listdir(source)
+            if name.lower().endswith(VIDEO_EXTENSIONS)
+        )
+        return [(v, provenance_dir_for(v)) for v in videos]
+
+    base = os.path.dirname(os.path.abspath(source))
+    jobs = []
+    with open(source) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                entry = json.loads(line)
+                video, prov = entry["video"], entry.get("provenance")
+            else:
+                video, _, prov = line.partition("\t")
+            video = os.path.join(base, video)
+            prov = os.path.join(base, prov) if prov else provenance_dir_for(video)
+            jobs.append((video, prov))
+    return jobs
+
+
+# ----------------------------
+# Workers
+# ----------------------------
+
+_public_key = None
+
+
+def _init_worker(key_path: str):
+    # Each worker process loads the public key once
+    global _public_key
+    _public_key = load_public_key(key_path)
+
+
+def _verify_one(video_path: str, provenance_dir: str):
+    start = time.perf_counter()
+    try:
+        # One process per file already fills the cores; don't nest pools
+        report = verify_video(video_path, provenance_dir=provenance_dir, public_key=_public_key,
+                              workers=1, quiet=True)
+    except Exception as e:
+        report = {
+            "file": video_path,
+            "status": "ERROR",
+            "error": f"{type(e).__name__}: {e}",
+            "total_frames_checked": 0,
+        }
+    report["provenance"] = provenance_dir
+    report["elapsed_s"] = round(time.perf_counter() - start, 3)
+    return report
+
+
+# ----------------------------
+# Batch verification
+# ----------------------------
+
+def verify_batch(jobs, out, workers=None, key_path: str = PUBLIC_KEY_PATH):
+    """
+    Verify every (video, provenance_dir) job across a process pool, writing
+    one NDJSON line to `out` per file as it finishes. Returns summary stats.
+    """
+    workers = workers or os.cpu_count() or 1
+    summary = {"files": len(jobs), "verified": 0, "verified_prefix": 0, "failed": 0, "errors": 0, "frames": 0}
+
+    # Largest files first so a long clip doesn't start last and run alone
+    jobs = sorted(jobs, key=lambda job: os.path.getsize(job[0]) if os.path.exists(job[0]) else 0, reverse=True)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(key_path,)) as pool:
+        futures = [pool.submit(_verify_one, video, prov) for video, prov in jobs]
+        for future in as_completed(futures):
+            report = future.result()
+            out.write(json.dumps(report) + "\n")
+            out.flush()
+
+            summary["frames"] += report["total_frames_checked"]
+            if report["status"] == "VERIFIED":
+                summary["verified"] += 1
+            elif report["status"] == "VERIFIED_PREFIX":
+                summary["verified_prefix"] += 1
+            elif report["status"] == "ERROR":
+                summary["errors"] += 1
+            else:
+                summary["failed"] += 1
+
+    elapsed = time.perf_counter() - start
+    summary["workers"] = workers
+    summary["elapsed_s"] = round(elapsed, 3)
+    summary["files_per_s"] = round(len(jobs) / elapsed, 2) if elapsed else 0.0
+    summary["fps"] = round(summary["frames"] / elapsed, 1) if elapsed else 0.0
+    return summary
+
+
+# ----------------------------
+# CLI entry
+# ----------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify many signed videos in parallel")
+    parser.add_argument("source", help="directory of videos, or a manifest file")
+    parser.add_argument("--report", default="batch_verification_report.ndjson",
+                        help="NDJSON output path ('-' for stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--public-key", default=PUBLIC_KEY_PATH)
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.source)
+    if not jobs:
+        print(f"Error: no videos found in {args.source}")
+        sys.exit(1)
+
+    if args.report == "-":
+        summary = verify_batch(jobs, sys.stdout, args.workers, args.public_key)
+        log = sys.stderr
+    else:
+        with open(args.report, "w") as out:
+            summary = verify_batch(jobs, out, args.workers, args.public_key)
+        log = sys.stdout
+
+    print(f"✔ {summary['verified']} verified, {summary['verified_prefix']} verified up to a checkpoint, "
+          f"✘ {summary['failed']} failed, {summary['errors']} errors "
+          f"({summary['files']} files, {summary['workers']} workers)", file=log)
+    print(f"  {summary['elapsed_s']} s, {summary['files_per_s']} files/s, {summary['fps']} fps", file=log)
+    if args.report != "-":
+        print(f"  Report written to {args.report}", file=log)
@@ -0,0 +1,88 @@
+import bisect
+import struct
+
+# ----------------------------
+# Keyframe index
+# ----------------------------
+#
+# Maps keyframes to their presentation frame number and container
+# timestamp so readers can seek straight to the keyframe before a frame
+# instead of decoding from frame 0. The index is only a seek hint:
+# frames reached through it are still checked against the signed hashes,
+# so a wrong index can cause a mismatch but never a false pass.
+#
+# video_index.bin = header + one record per keyframe, in frame order.
+
+MAGIC = b"HIDX"
+VERSION = 2
+HEADER = struct.Struct("<4sBxxxQIIq")  # magic, version, frame_count, time_base num/den, first pts
+RECORD = struct.Struct("<Qq")  # frame number, pts
+
+
+def build_index(video_path: str, index_path: str, frame_count: int):
+    """
+    Demux (without decoding) the first video stream and write its keyframe
+    index. Returns the number of keyframes, or None when PyAV is missing or
+    the container's frames don't line up with the `frame_count` decoded
+    frames (frame numbers would then be wrong).
+    """
+    try:
+        import av
+    except ImportError:
+        return None
+
+    with av.open(video_path) as container:
+        stream = container.streams.video[0]
+        packets = [(p.pts, p.is_keyframe) for p in container.demux(stream) if p.pts is not None]
+        time_base = stream.time_base
+
+    if len(packets) != frame_count:
+        return None
+
+    # Packets arrive in decode order; a frame's number is its rank by pts
+    ordered = sorted(pts for pts, _ in packets)
+    rank = {pts: i for i, pts in enumerate(ordered)}
+    keyframes = sorted((rank[pts], pts) for pts, key in packets if key)
+
+    with open(index_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(ordered), time_base.numerator, time_base.denominator, ordered[0]))
+        for record in keyframes:
+            f.write(RECORD.pack(*record))
+
+    return len(keyframes)
+
+
+class KeyframeIndex:
+    """Reader for a video_index.bin file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version, self.frame_count, tb_num, tb_den, self.first_pts = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a keyframe index")
+        if version != VERSION:
+            raise ValueError(f"Unsupported keyframe index version {version}")
+        self.time_base = tb_num / tb_den
+
+        self.frames = []
+        self.pts = []
+        for frame, pts in RECORD.iter_unpack(data[HEADER.size:]):
+            self.frames.append(frame)
+            self.pts.append(pts)
+
+    def seek_point(self, frame_index: int):
+        """(keyframe frame number, pts) for the last keyframe at or before `frame_index`."""
+        i = bisect.bisect_right(self.frames, frame_index) - 1
+        if i < 0:
+            return 0, self.first_pts
+        return self.frames[i], self.pts[i]
+
+
+def load_index(path: str):
+    """KeyframeIndex for `path`, or None if the video was signed without one."""
+    try:
+        return KeyframeIndex(path)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,155 @@
+import hashlib
+import struct
+
+# ----------------------------
+# Segmented Merkle provenance
+# ----------------------------
+#
+# Every frame is hashed independently into a leaf. Leaves form one binary
+# tree (an odd node at the end of a level is carried up unchanged), so each
+# aligned group of SEGMENT_SIZE frames is a complete subtree: segments can be
+# verified in parallel, and any frame range can be checked against the signed
+# root with O(log n) sibling hashes.
+#
+# video_merkle.bin = header + every tree level, leaves first, root last.
+
+MAGIC = b"HMRK"
+VERSION = 1
+HEADER = struct.Struct("<4sBxxxIQ")  # magic, version, segment_size, frame_count
+HASH_SIZE = 32
+SEGMENT_SIZE = 256
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def leaf_hash(frame) -> bytes:
+    h = hashlib.sha256(LEAF_PREFIX)
+    h.update(frame)
+    return h.digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def next_level(level):
+    parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        parents.append(level[-1])
+    return parents
+
+
+def build_levels(leaves):
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        levels.append(next_level(levels[-1]))
+    return levels
+
+
+def subtree_root(leaves) -> bytes:
+    return build_levels(leaves)[-1][0]
+
+
+def level_sizes(frame_count: int):
+    sizes = [frame_count]
+    while sizes[-1] > 1:
+        sizes.append((sizes[-1] + 1) // 2)
+    return sizes
+
+
+def signed_digest(frame_count: int, segment_size: int, root: bytes) -> bytes:
+    """The message signed for a Merkle provenance file."""
+    return hashlib.sha256(HEADER.pack(MAGIC, VERSION, segment_size, frame_count) + root).digest()
+
+
+def write_tree(path: str, leaves, segment_size: int = SEGMENT_SIZE) -> bytes:
+    """Write the full tree for `leaves` and return its root."""
+    if not leaves:
+        raise ValueError("Cannot build a Merkle tree for a video with no frames")
+    if segment_size < 1 or segment_size & (segment_size - 1):
+        raise ValueError("segment_size must be a power of two")
+
+    levels = build_levels(leaves)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, segment_size, len(leaves)))
+        for level in levels:
+            f.write(b"".join(level))
+    return levels[-1][0]
+
+
+class MerkleTree:
+    """Random-access reader over a video_merkle.bin file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, self.segment_size, self.frame_count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Merkle provenance file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported Merkle provenance version {version}")
+
+        self.sizes = level_sizes(self.frame_count)
+        self.offsets = []
+        offset = HEADER.size
+        for size in self.sizes:
+            self.offsets.append(offset)
+            offset += size * HASH_SIZE
+
+    @property
+    def segment_count(self) -> int:
+        return (self.frame_count + self.segment_size - 1) // self.segment_size
+
+    @property
+    def segment_level(self) -> int:
+        return self.segment_size.bit_length() - 1
+
+    def segment_range(self, segment: int):
+        start = segment * self.segment_size
+        return start, min(start + self.segment_size, self.frame_count)
+
+    def read_nodes(self, level: int, start: int, stop: int):
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[level] + start * HASH_SIZE)
+            data = f.read((stop - start) * HASH_SIZE)
+        return [data[i:i + HASH_SIZE] for i in range(0, len(data), HASH_SIZE)]
+
+    def root(self) -> bytes:
+        return self.read_nodes(len(self.sizes) - 1, 0, 1)[0]
+
+    def range_proof(self, start: int, stop: int):
+        """
+        Sibling nodes needed to recompute the root from leaves [start, stop).
+        Returns {(level, index): hash}; a contiguous range needs at most two
+        per level.
+        """
+        proof = {}
+        with open(self.path, "rb") as f:
+            for level, size in enumerate(self.sizes[:-1]):
+                for idx in (start - 1 if start % 2 else None, stop if stop % 2 else None):
+                    if idx is not None and idx < size:
+                        f.seek(self.offsets[level] + idx * HASH_SIZE)
+                        proof[(level, idx)] = f.read(HASH_SIZE)
+                start //= 2
+                stop = (stop + 1) // 2
+        return proof
+
+    def root_from_range(self, start: int, leaves, proof) -> bytes:
+        """Fold `leaves` (frames start..start+len-1) and `proof` up to a root."""
+        nodes = list(leaves)
+        for level, size in enumerate(self.sizes[:-1]):
+            if start % 2:
+                nodes.insert(0, proof[(level, start - 1)])
+                start -= 1
+            if (start + len(nodes)) % 2 and start + len(nodes) < size:
+                nodes.append(proof[(level, start + len(nodes))])
+            nodes = next_level(nodes)
+            start //= 2
+        return nodes[0]
+
+    def root_from_segments(self, segment_roots) -> bytes:
+        level = list(segment_roots)
+        while len(level) > 1:
+            level = next_level(level)
+        return level[0]
@@ -1,44 +1,105 @@
 import sys
 import os
-import imageio.v3 as iio
-import numpy as np
+import glob
+import argparse
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import ec
-from video_utils import chained_hash
+from video_utils import ChainWriter, chained_hash, iter_frame_buffers
+import video_index
+import video_merkle
 
-def sign_video(video_path: str):
-    # Ensure provenance directory exists
-    os.makedirs("provenance", exist_ok=True)
-    
+PROVENANCE_DIR = "provenance"
+PRIVATE_KEY_PATH = "keys/private_key.pem"
+
+# Every file a signing or verification run may produce; a new signing
+# clears them all so verify_video never mixes outputs from different
+# signings, and no stale report or overlay outlives the video it describes
+PROVENANCE_FILES = ["video_chain.bin", "video_sig.bin", "video_merkle.bin", "video_merkle_sig.bin",
+                    "video_index.bin", "video_checkpoints.bin", "video_verification_report.json"]
+
+def load_private_key(path: str = PRIVATE_KEY_PATH):
     # Check if private key exists
-    if not os.path.exists("keys/private_key.pem"):
-        print("Error: keys/private_key.pem not found")
+    if not os.path.exists(path):
+        print(f"Error: {path} not found")
         sys.exit(1)
+
+    with open(path, "rb") as f:
+        return serialization.load_pem_private_key(f.read(), password=None, backend=None)
+
+def clear_provenance(provenance_dir: str):
+    for name in PROVENANCE_FILES:
+        path = os.path.join(provenance_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+    for path in glob.glob(os.path.join(glob.escape(provenance_dir), "mismatch_frame_*.png")):
+        os.remove(path)
+
+def sign_video(video_path: str, fmt: str = "chain", segment_size: int = video_merkle.SEGMENT_SIZE,
+               provenance_dir: str = PROVENANCE_DIR):
+    # Ensure provenance directory exists
+    os.makedirs(provenance_dir, exist_ok=True)
     
-    with open("keys/private_key.pem", "rb") as f:
-        private_key = serialization.load_pem_private_key(f.read(), password=None, backend=None)
+    private_key = load_private_key()
 
-    prev_hash = b"\x00" * 32
-    chain = []
+    # verify_video picks the format from which files exist, so drop the
+    # output of any previous signing
+    clear_provenance(provenance_dir)
 
-    for frame in iio.imiter(video_path):
-        frame_bytes = frame.astype(np.uint8).tobytes()
-        curr_hash = chained_hash(frame_bytes, prev_hash)
-        chain.append(curr_hash)
-        prev_hash = curr_hash
+    if fmt == "merkle":
+        frame_count = sign_video_merkle(video_path, private_key, segment_size, provenance_dir)
+    else:
+        frame_count = sign_video_chain(video_path, private_key, provenance_dir)
 
-    with open("provenance/video_chain.bin", "wb") as f:
-        for h in chain:
-            f.write(h)
+    keyframes = video_index.build_index(video_path, os.path.join(provenance_dir, "video_index.bin"), frame_count)
+    if keyframes is None:
+        print("  (No keyframe index: PyAV missing or container frames don't match decoded frames)")
+    else:
+        print(f"  Keyframe index written ({keyframes} keyframes)")
+
+def sign_video_chain(video_path: str, private_key, provenance_dir: str = PROVENANCE_DIR) -> int:
+    prev_hash = b"\x00" * 32
+
+    with ChainWriter(os.path.join(provenance_dir, "video_chain.bin")) as chain:
+        for frame_buf in iter_frame_buffers(video_path):
+            curr_hash = chained_hash(frame_buf, prev_hash)
+            chain.append(curr_hash)
+            prev_hash = curr_hash
 
     signature = private_key.sign(prev_hash, ec.ECDSA(hashes.SHA256()))
-    with open("provenance/video_sig.bin", "wb") as f:
+    with open(os.path.join(provenance_dir, "video_sig.bin"), "wb") as f:
         f.write(signature)
 
     print("✔ Video signed successfully")
+    return chain.frame_count
+
+def sign_video_merkle(video_path: str, private_key, segment_size: int,
+                      provenance_dir: str = PROVENANCE_DIR) -> int:
+    leaves = [video_merkle.leaf_hash(frame_buf) for frame_buf in iter_frame_buffers(video_path)]
+
+    root = video_merkle.write_tree(os.path.join(provenance_dir, "video_merkle.bin"), leaves, segment_size)
+
+    digest = video_merkle.signed_digest(len(leaves), segment_size, root)
+    signature = private_key.sign(digest, ec.ECDSA(hashes.SHA256()))
+    with open(os.path.join(provenance_dir, "video_merkle_sig.bin"), "wb") as f:
+        f.write(signature)
+
+    print(f"✔ Video signed successfully ({len(leaves)} frames, Merkle segments of {segment_size})")
+    return len(leaves)
+
+def _segment_size(value: str) -> int:
+    size = int(value)
+    if size < 1 or size & (size - 1):
+        raise argparse.ArgumentTypeError("must be a power of two (1, 2, 4, ...)")
+    return size
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python video_sign.py <video.mp4>")
-        sys.exit(1)
-    sign_video(sys.argv[1])
+    parser = argparse.ArgumentParser(description="Sign a video's frames with ECDSA-P256")
+    parser.add_argument("video")
+    parser.add_argument("--format", choices=["chain", "merkle"], default="chain",
+                        help="chain: sequential hash chain; merkle: segmented Merkle tree")
+    parser.add_argument("--segment-size", type=_segment_size, default=video_merkle.SEGMENT_SIZE,
+                        help="frames per Merkle segment (power of two)")
+    parser.add_argument("--provenance-dir", default=PROVENANCE_DIR,
+                        help="directory to write the video's provenance files to")
+    args = parser.parse_args()
+    sign_video(args.video, args.format, args.segment_size, args.provenance_dir)
@@ -0,0 +1,141 @@
+import sys
+import os
+import time
+import argparse
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from video_utils import (
+    CHECKPOINT_RECORD,
+    ChainWriter,
+    chained_hash,
+    checkpoint_digest,
+    iter_frame_buffers,
+)
+from video_sign import PROVENANCE_DIR, clear_provenance, load_private_key
+
+CHECKPOINT_FRAMES = 300      # 10 s at 30 fps
+CHECKPOINT_SECONDS = 10.0
+
+
+class StreamSigner:
+    """
+    Signs frames as they arrive. Each frame's chained hash is appended to
+    video_chain.bin immediately, and every `every_frames` frames or
+    `every_seconds` seconds the chain is synced to disk and its current
+    hash signed into video_checkpoints.bin. If the stream dies, everything
+    up to the last checkpoint still verifies.
+    """
+
+    def __init__(self, private_key, provenance_dir: str = PROVENANCE_DIR,
+                 every_frames: int = CHECKPOINT_FRAMES, every_seconds: float = CHECKPOINT_SECONDS):
+        self.private_key = private_key
+        self.provenance_dir = provenance_dir
+        self.every_frames = every_frames
+        self.every_seconds = every_seconds
+
+        os.makedirs(provenance_dir, exist_ok=True)
+        clear_provenance(provenance_dir)
+
+        self.chain = ChainWriter(os.path.join(provenance_dir, "video_chain.bin"))
+        self._checkpoints = open(os.path.join(provenance_dir, "video_checkpoints.bin"), "wb")
+        self.prev_hash = b"\x00" * 32
+        self.checkpointed_frames = 0
+        self._last_checkpoint = time.monotonic()
+
+    @property
+    def frame_count(self) -> int:
+        return self.chain.frame_count
+
+    def add_frame(self, frame_buf):
+        self.prev_hash = chained_hash(frame_buf, self.prev_hash)
+        self.chain.append(self.prev_hash)
+
+        if (self.frame_count - self.checkpointed_frames >= self.every_frames
+                or time.monotonic() - self._last_checkpoint >= self.every_seconds):
+            self.checkpoint()
+
+    def checkpoint(self):
+        self._last_checkpoint = time.monotonic()
+        if self.frame_count == self.checkpointed_frames:
+            return
+
+        # The hashes must be on disk before a signature vouches for them
+        self.chain.sync()
+
+        digest = checkpoint_digest(self.frame_count, self.prev_hash)
+        signature = self.private_key.sign(digest, ec.ECDSA(hashes.SHA256()))
+        self._checkpoints.write(CHECKPOINT_RECORD.pack(self.frame_count, len(signature)) + signature)
+        self._checkpoints.flush()
+        os.fsync(self._checkpoints.fileno())
+
+        self.checkpointed_frames = self.frame_count
+
+    def close(self):
+        """Final checkpoint plus the usual whole-video signature."""
+        self.checkpoint()
+        self.chain.close()
+        self._checkpoints.close()
+
+        signature = self.private_key.sign(self.prev_hash, ec.ECDSA(hashes.SHA256()))
+        with open(os.path.join(self.provenance_dir, "video_sig.bin"), "wb") as f:
+            f.write(signature)
+
+
+def iter_raw_frames(stream, width: int, height: int):
+    """
+    Raw rgb24 frames from a pipe (e.g. ffmpeg -f rawvideo -pix_fmt rgb24 -).
+    One buffer is reused, so each yielded view is only valid until the next.
+    """
+    frame = bytearray(width * height * 3)
+    view = memoryview(frame)
+    while True:
+        filled = 0
+        while filled < len(frame):
+            n = stream.readinto(view[filled:])
+            if not n:
+                return
+            filled += n
+        yield view
+
+
+def sign_stream(frames, provenance_dir: str = PROVENANCE_DIR,
+                every_frames: int = CHECKPOINT_FRAMES, every_seconds: float = CHECKPOINT_SECONDS):
+    signer = StreamSigner(load_private_key(), provenance_dir, every_frames, every_seconds)
+    start = time.perf_counter()
+    try:
+        for frame_buf in frames:
+            signer.add_frame(frame_buf)
+    except KeyboardInterrupt:
+        print("Stream interrupted, closing signature")
+    finally:
+        signer.close()
+
+    elapsed = time.perf_counter() - start
+    fps = signer.frame_count / elapsed if elapsed else 0.0
+    print(f"✔ Stream signed successfully ({signer.frame_count} frames, {fps:.1f} fps)")
+    return signer.frame_count
+
+
+def _frame_size(value: str):
+    width, _, height = value.partition("x")
+    return int(width), int(height)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sign a live video stream with periodic checkpoints")
+    parser.add_argument("source", help="video file/device, or '-' for raw rgb24 frames on stdin")
+    parser.add_argument("--size", type=_frame_size, metavar="WxH", help="frame size for raw stdin input")
+    parser.add_argument("--checkpoint-frames", type=int, default=CHECKPOINT_FRAMES)
+    parser.add_argument("--checkpoint-seconds", type=float, default=CHECKPOINT_SECONDS)
+    parser.add_argument("--provenance-dir", default=PROVENANCE_DIR)
+    args = parser.parse_args()
+
+    if args.source == "-":
+        if not args.size:
+            print("Error: --size WxH is required for raw stdin input")
+            sys.exit(1)
+        frames = iter_raw_frames(sys.stdin.buffer, *args.size)
+    else:
+        frames = iter_frame_buffers(args.source)
+
+    sign_stream(frames, args.provenance_dir, args.checkpoint_frames, args.checkpoint_seconds)
@@ -1,7 +1,298 @@
 import hashlib
+import mmap
+import os
+import queue
+import struct
+import threading
 
-def chained_hash(frame: bytes, prev_hash: bytes) -> bytes:
+import imageio.v3 as iio
+import numpy as np
+
+# Decoded frames buffered ahead of the hasher. Each 1080p RGB frame is
+# ~6 MB, so this bounds decode read-ahead to a few tens of MB.
+FRAME_QUEUE_SIZE = 8
+
+_DONE = object()
+
+# video_chain.bin = header + one 32-byte hash per frame (the C signer and
+# verifier under video/ use the same layout). Files written before the
+# header existed are bare hashes with no magic. A headered file
+# cut short mid-write (e.g. a crashed live stream) keeps its whole hashes;
+# a trailing partial hash is ignored.
+CHAIN_MAGIC = b"HCHN"
+CHAIN_VERSION = 2
+CHAIN_HEADER = struct.Struct("<4sBxxxQ")  # magic, version, frame_count
+HASH_SIZE = 32
+
+# video_checkpoints.bin = append-only records of (frame count, DER
+# signature length, signature). Each signature covers checkpoint_digest()
+# of the chain hash after that many frames. A record cut short by a crash
+# is ignored.
+CHECKPOINT_MAGIC = b"HCKP"
+CHECKPOINT_RECORD = struct.Struct("<QB")
+
+
+def chained_hash(frame, prev_hash: bytes) -> bytes:
+    # frame may be bytes or any contiguous buffer (e.g. a memoryview)
     h = hashlib.sha256()
     h.update(frame)
     h.update(prev_hash)
-    return h.digest()
\ No newline at end of file
+    return h.digest()
+
+
+def checkpoint_digest(frame_count: int, chain_hash: bytes) -> bytes:
+    """The message signed at a live-stream checkpoint."""
+    return hashlib.sha256(CHECKPOINT_MAGIC + struct.pack("<Q", frame_count) + chain_hash).digest()
+
+
+def load_checkpoints(path: str):
+    """[(frame_count, signature), ...] in file order; [] if there are none."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+
+    checkpoints = []
+    offset = 0
+    while offset + CHECKPOINT_RECORD.size <= len(data):
+        frame_count, sig_len = CHECKPOINT_RECORD.unpack_from(data, offset)
+        offset += CHECKPOINT_RECORD.size
+        if offset + sig_len > len(data):
+            break
+        checkpoints.append((frame_count, data[offset:offset + sig_len]))
+        offset += sig_len
+    return checkpoints
+
+
+class ChainWriter:
+    """
+    Streams hashes to a chain file. The header's frame count is patched in
+    on flush()/close(), so the file is readable while it is still growing.
+    """
+
+    def __init__(self, path: str):
+        self.frame_count = 0
+        self._f = open(path, "wb")
+        self._f.write(CHAIN_HEADER.pack(CHAIN_MAGIC, CHAIN_VERSION, 0))
+
+    def append(self, h: bytes):
+        self._f.write(h)
+        self.frame_count += 1
+
+    def flush(self):
+        end = self._f.tell()
+        self._f.seek(0)
+        self._f.write(CHAIN_HEADER.pack(CHAIN_MAGIC, CHAIN_VERSION, self.frame_count))
+        self._f.seek(end)
+        self._f.flush()
+
+    def sync(self):
+        """flush() and force it to disk, so a crash keeps everything so far."""
+        self.flush()
+        os.fsync(self._f.fileno())
+
+    def close(self):
+        self.flush()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ChainView:
+    """
+    Memory-mapped, read-only view of a chain file. chain[i] is a zero-copy
+    memoryview of frame i's hash, so verification can start immediately and
+    stop at the first mismatch without touching the rest of the file.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            size = f.seek(0, 2)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._view = memoryview(self._mmap) if self._mmap else memoryview(b"")
+
+        offset = 0
+        self.version = 1
+        self.frame_count = size // HASH_SIZE
+        if size >= CHAIN_HEADER.size and self._view[:len(CHAIN_MAGIC)] == CHAIN_MAGIC:
+            _, version, frame_count = CHAIN_HEADER.unpack_from(self._view)
+            if version != CHAIN_VERSION:
+                raise ValueError(f"Unsupported hash chain version {version}")
+            offset = CHAIN_HEADER.size
+            self.version = version
+            # Never trust the header past the hashes actually on disk
+            self.frame_count = min(frame_count, (size - offset) // HASH_SIZE)
+        elif size % HASH_SIZE:
+            raise ValueError(f"{path} is not a hash chain file, or is truncated")
+
+        self._hashes = self._view[offset:offset + self.frame_count * HASH_SIZE]
+
+    def __len__(self) -> int:
+        return self.frame_count
+
+    def __getitem__(self, idx: int) -> memoryview:
+        if not 0 <= idx < self.frame_count:
+            raise IndexError(idx)
+        return self._hashes[idx * HASH_SIZE:(idx + 1) * HASH_SIZE]
+
+    def close(self):
+        self._hashes.release()
+        self._view.release()
+        if self._mmap:
+            self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def frame_buffer(frame: np.ndarray) -> memoryview:
+    """
+    Flat uint8 view of a decoded frame. Frames that are already contiguous
+    uint8 (the usual case) are not copied.
+    """
+    frame = np.ascontiguousarray(frame, dtype=np.uint8)
+    return memoryview(frame).cast("B")
+
+
+def _first_frame(frames):
+    for frame in frames:
+        return frame
+    return None
+
+
+def _pyav_matches_default(video_path: str) -> bool:
+    """
+    Whether PyAV decodes frame 0 to the same pixels as the plugin imageio
+    picks for this file (the one signing used). Seeking goes through PyAV
+    for every container, so its output must be byte-identical.
+    """
+    import av
+
+    with iio.imopen(video_path, "r", legacy_mode=True) as video:
+        expected = _first_frame(video.iter())
+    with av.open(video_path) as container:
+        frame = _first_frame(container.decode(video=0))
+    return expected is not None and frame is not None and np.array_equal(expected, frame.to_ndarray(format="rgb24"))
+
+
+def _decode_from_keyframe(video_path: str, pts: int):
+    """
+    Frames from the keyframe at `pts` onwards. The landing frame's pts is
+    checked, so a seek that ends up anywhere else raises instead of
+    silently shifting every frame number after it.
+    """
+    import av
+
+    with av.open(video_path) as container:
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+        one_second = int(1 / stream.time_base)
+
+        # Some containers (e.g. MPEG-TS) seek approximately and can land past
+        # the keyframe; back off and decode forward to its exact pts
+        for back_off in (0, 1, 2, 4, 8):
+            container.seek(pts - back_off * one_second, stream=stream, backward=True, any_frame=False)
+            frames = container.decode(stream)
+            frame = _first_frame(f for f in frames if f.pts is not None and f.pts >= pts)
+            if frame is None:
+                raise RuntimeError(f"No frame at or after keyframe pts {pts}")
+            if frame.pts == pts:
+                yield frame.to_ndarray(format="rgb24")
+                for frame in frames:
+                    yield frame.to_ndarray(format="rgb24")
+                return
+
+        raise RuntimeError(f"Could not seek to keyframe pts {pts}")
+
+
+def iter_frames(video_path: str, start: int = 0, stop=None, keyframes=None):
+    """
+    Decode frames [start, stop) as arrays. With a KeyframeIndex the decoder
+    seeks straight to the last keyframe before `start`; without one, or if
+    the seek can't be confirmed, it decodes from frame 0, since frame
+    numbers can only be mapped to timestamps through the index.
+    """
+    if start > 0 and keyframes is not None:
+        key_frame, pts = keyframes.seek_point(start)
+        if key_frame > 0:
+            yielded = False
+            try:
+                if _pyav_matches_default(video_path):
+                    for idx, frame in enumerate(_decode_from_keyframe(video_path, pts), key_frame):
+                        if stop is not None and idx >= stop:
+                            return
+                        if idx >= start:
+                            yielded = True
+                            yield frame
+                    return
+            except Exception:
+                if yielded:
+                    raise
+            # fall back to decoding from frame 0
+
+    with iio.imopen(video_path, "r", legacy_mode=True) as video:
+        # pyav can decode with frame/slice threads; the ffmpeg plugin
+        # already decodes in a separate process
+        kwargs = {"thread_type": "AUTO"} if type(video).__name__ == "PyAVPlugin" else {}
+        for idx, frame in enumerate(video.iter(**kwargs)):
+            if stop is not None and idx >= stop:
+                return
+            if idx >= start:
+                yield frame
+
+
+def iter_frame_buffers(video_path: str, queue_size: int = FRAME_QUEUE_SIZE, start: int = 0, stop=None,
+                       keyframes=None):
+    """
+    Yield a flat uint8 buffer for every frame in the video, or for frames
+    [start, stop) when a range is given (see iter_frames).
+
+    Decoding runs in a background thread that stays at most `queue_size`
+    frames ahead, so hashing the current frame (hashlib releases the GIL
+    for large buffers) overlaps with decoding the next one.
+    """
+    frames = queue.Queue(maxsize=queue_size)
+    cancelled = threading.Event()
+
+    def put(item):
+        while not cancelled.is_set():
+            try:
+                frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def decode():
+        try:
+            for frame in iter_frames(video_path, start, stop, keyframes):
+                if not put(frame):
+                    return
+        except BaseException as e:
+            put(e)
+            return
+        put(_DONE)
+
+    decoder = threading.Thread(target=decode, name="hemlock-decode", daemon=True)
+    decoder.start()
+
+    try:
+        while True:
+            item = frames.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield frame_buffer(item)
+    finally:
+        # Consumer stopped early (e.g. first mismatch): let the decoder exit
+        cancelled.set()
+        decoder.join()
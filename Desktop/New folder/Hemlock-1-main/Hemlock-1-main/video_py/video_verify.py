@@ -1,13 +1,20 @@
 import sys
+import os
 import json
-import numpy as np
+import argparse
 import imageio.v3 as iio
+from concurrent.futures import ProcessPoolExecutor
 
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.exceptions import InvalidSignature
 
-from video_utils import chained_hash
+from video_utils import ChainView, chained_hash, checkpoint_digest, iter_frame_buffers, iter_frames, load_checkpoints
+import video_index
+import video_merkle
+
+PROVENANCE_DIR = "provenance"
+PUBLIC_KEY_PATH = "keys/public_key.pem"
 
 
 # ----------------------------
@@ -15,73 +22,109 @@ from video_utils import chained_hash
 # ----------------------------
 
 def load_chain(path):
-    chain = []
+    return ChainView(path)
+
+
+def load_public_key(path: str = PUBLIC_KEY_PATH):
     with open(path, "rb") as f:
-        while True:
-            h = f.read(32)
-            if not h:
-                break
-            chain.append(h)
-    return chain
+        return serialization.load_pem_public_key(f.read())
 
 
-def save_mismatch_overlay(video_path: str, frame_index: int):
+def save_mismatch_overlay(video_path: str, frame_index: int, provenance_dir: str = PROVENANCE_DIR):
     """
     Save the mismatched frame with a red forensic overlay.
+    Returns the image path, or None if the frame doesn't exist.
     """
-    for idx, frame in enumerate(iio.imiter(video_path)):
-        if idx == frame_index:
-            frame = frame.copy()
-            h, w, _ = frame.shape
+    keyframes = video_index.load_index(os.path.join(provenance_dir, "video_index.bin"))
+    for frame in iter_frames(video_path, frame_index, frame_index + 1, keyframes):
+        frame = frame.copy()
+        h, w, _ = frame.shape
 
-            thickness = 10  # border thickness
+        thickness = 10  # border thickness
 
-            # Red border
-            frame[:thickness, :, :] = [255, 0, 0]
-            frame[-thickness:, :, :] = [255, 0, 0]
-            frame[:, :thickness, :] = [255, 0, 0]
-            frame[:, -thickness:, :] = [255, 0, 0]
+        # Red border
+        frame[:thickness, :, :] = [255, 0, 0]
+        frame[-thickness:, :, :] = [255, 0, 0]
+        frame[:, :thickness, :] = [255, 0, 0]
+        frame[:, -thickness:, :] = [255, 0, 0]
 
-            out_path = f"provenance/mismatch_frame_{frame_index}.png"
-            iio.imwrite(out_path, frame)
+        out_path = os.path.join(provenance_dir, f"mismatch_frame_{frame_index}.png")
+        iio.imwrite(out_path, frame)
+        return out_path
 
-            print(f"🖼️  Mismatch frame saved to {out_path}")
-            return
+    return None
 
 
 # ----------------------------
 # Main verification
 # ----------------------------
 
-def verify_video(video_path: str):
-    report = {
-        "file": video_path,
-        "status": "UNKNOWN",
-        "failure_type": None,
-        "first_mismatched_frame": None,
-        "total_frames_checked": 0,
-        "signed_by": "ECDSA-P256",
-        "verified_with_public_key": True
-    }
+def verify_video(video_path: str, frames=None, provenance_dir: str = PROVENANCE_DIR, public_key=None,
+                 workers=None, quiet: bool = False):
+    # Load public key (batch callers pass one in to avoid reloading it)
+    if public_key is None:
+        public_key = load_public_key()
+
+    if os.path.exists(os.path.join(provenance_dir, "video_merkle.bin")):
+        report = verify_video_merkle(video_path, public_key, frames, workers, provenance_dir)
+    elif frames is not None:
+        print("Error: frame range verification needs a Merkle provenance file (sign with --format merkle)")
+        sys.exit(1)
+    else:
+        report = verify_video_chain(video_path, public_key, provenance_dir)
+
+    # Visual evidence; a stream cut off after its last checkpoint has
+    # nothing tampered to show
+    if report["status"] not in ("VERIFIED", "VERIFIED_PREFIX"):
+        report["mismatch_overlay"] = save_mismatch_overlay(video_path, report["first_mismatched_frame"],
+                                                           provenance_dir)
+
+    # Write JSON report
+    with open(os.path.join(provenance_dir, "video_verification_report.json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+    # Console output
+    if quiet:
+        return report
+    if report["status"] == "VERIFIED":
+        print("✔ Video verified successfully")
+    elif report["status"] == "VERIFIED_PREFIX":
+        print(f"✔ First {report['verified_prefix_frames']} frames verified up to the last checkpoint")
+        print(f"  Rest unverified: {report['failure_type']} at frame {report['first_mismatched_frame']}")
+    else:
+        print("✘ Video verification failed")
+        print(f"  Reason: {report['failure_type']}")
+        print(f"  First mismatched frame: {report['first_mismatched_frame']}")
+        if report["mismatch_overlay"]:
+            print(f"🖼️  Mismatch frame saved to {report['mismatch_overlay']}")
 
-    # Load public key
-    with open("keys/public_key.pem", "rb") as f:
-        public_key = serialization.load_pem_public_key(f.read())
+    return report
 
-    # Load stored hash chain
-    stored_chain = load_chain("provenance/video_chain.bin")
 
+def _match_chain(video_path: str, stored_chain, report, checkpoint_counts=()):
+    """
+    Stream frames against the stored chain; stops at the first mismatch.
+    Also returns the computed chain hash after each of `checkpoint_counts`
+    frames.
+    """
     prev_hash = b"\x00" * 32
     last_valid_frame = -1
+    checkpoint_hashes = {}
 
     # Frame-by-frame verification
-    for idx, frame in enumerate(iio.imiter(video_path)):
+    for idx, frame_buf in enumerate(iter_frame_buffers(video_path)):
         report["total_frames_checked"] += 1
 
-        frame_bytes = frame.astype(np.uint8).tobytes()
-        curr_hash = chained_hash(frame_bytes, prev_hash)
+        curr_hash = chained_hash(frame_buf, prev_hash)
+
+        if idx >= len(stored_chain):
+            # Video continues past the signed frames
+            report["status"] = "FAILED"
+            report["failure_type"] = "FRAME_COUNT_MISMATCH"
+            report["first_mismatched_frame"] = idx
+            break
 
-        if idx >= len(stored_chain) or curr_hash != stored_chain[idx]:
+        if curr_hash != stored_chain[idx]:
             report["status"] = "FAILED"
             report["failure_type"] = "FRAME_HASH_MISMATCH"
             report["first_mismatched_frame"] = idx
@@ -89,10 +132,74 @@ def verify_video(video_path: str):
 
         prev_hash = curr_hash
         last_valid_frame = idx
+        if idx + 1 in checkpoint_counts:
+            checkpoint_hashes[idx + 1] = curr_hash
+
+    return prev_hash, last_valid_frame, checkpoint_hashes
+
+
+def _verify_checkpoints(report, public_key, checkpoints, checkpoint_hashes, closed: bool):
+    """
+    After a failed full verification, find the latest checkpoint signature
+    that matches the frames actually seen. If the only problem was the
+    video or chain ending early (a live recording that was cut off), the
+    prefix up to that checkpoint counts as verified. A stream that was
+    closed signed its full length, so frames past it still fail.
+    """
+    # The last checkpoint is written on close, so it covers every frame
+    signed_count = max(count for count, _ in checkpoints)
+    if closed:
+        # Only the video or chain ending short of the signed frames
+        cut_off = (report["failure_type"] in ("FRAME_COUNT_MISMATCH", "SIGNATURE_MISMATCH")
+                   and report["first_mismatched_frame"] < signed_count)
     else:
+        cut_off = report["failure_type"] in ("FRAME_COUNT_MISMATCH", "SIGNATURE_MISSING")
+
+    for frame_count, signature in reversed(checkpoints):
+        chain_hash = checkpoint_hashes.get(frame_count)
+        if chain_hash is None:
+            continue
+        try:
+            public_key.verify(signature, checkpoint_digest(frame_count, chain_hash), ec.ECDSA(hashes.SHA256()))
+        except InvalidSignature:
+            continue
+
+        report["verified_prefix_frames"] = frame_count
+        if cut_off:
+            report["status"] = "VERIFIED_PREFIX"
+        return
+
+
+def verify_video_chain(video_path: str, public_key, provenance_dir: str = PROVENANCE_DIR):
+    report = {
+        "file": video_path,
+        "status": "UNKNOWN",
+        "failure_type": None,
+        "first_mismatched_frame": None,
+        "total_frames_checked": 0,
+        "signed_by": "ECDSA-P256",
+        "verified_with_public_key": True
+    }
+
+    # Live-stream signatures, if the video was signed by video_stream_sign.py
+    checkpoints = load_checkpoints(os.path.join(provenance_dir, "video_checkpoints.bin"))
+
+    # Map stored hash chain (nothing is read until a frame is compared)
+    with load_chain(os.path.join(provenance_dir, "video_chain.bin")) as stored_chain:
+        report["signed_frame_count"] = len(stored_chain)
+        prev_hash, last_valid_frame, checkpoint_hashes = _match_chain(
+            video_path, stored_chain, report, {count for count, _ in checkpoints})
+
+    if report["status"] == "UNKNOWN" and last_valid_frame + 1 < report["signed_frame_count"]:
+        # Video ended before the signed frames did
+        report["status"] = "FAILED"
+        report["failure_type"] = "FRAME_COUNT_MISMATCH"
+        report["first_mismatched_frame"] = last_valid_frame + 1
+
+    if report["status"] == "UNKNOWN":
         # Frame chain matched → verify signature
         try:
-            with open("provenance/video_sig.bin", "rb") as f:
+            with open(os.path.join(provenance_dir, "video_sig.bin"), "rb") as f:
                 signature = f.read()
 
             public_key.verify(
@@ -103,23 +210,150 @@ def verify_video(video_path: str):
 
             report["status"] = "VERIFIED"
 
+        except FileNotFoundError:
+            # A live stream that never closed has only checkpoint signatures
+            report["status"] = "FAILED"
+            report["failure_type"] = "SIGNATURE_MISSING"
+            report["first_mismatched_frame"] = last_valid_frame + 1
+
         except InvalidSignature:
             report["status"] = "FAILED"
             report["failure_type"] = "SIGNATURE_MISMATCH"
             report["first_mismatched_frame"] = last_valid_frame + 1
 
-    # Write JSON report
-    with open("provenance/video_verification_report.json", "w") as f:
-        json.dump(report, f, indent=2)
+    if report["status"] == "FAILED" and checkpoints:
+        closed = os.path.exists(os.path.join(provenance_dir, "video_sig.bin"))
+        _verify_checkpoints(report, public_key, checkpoints, checkpoint_hashes, closed)
 
-    # Console output + visual evidence
-    if report["status"] == "VERIFIED":
-        print("✔ Video verified successfully")
+    return report
+
+
+# ----------------------------
+# Merkle verification
+# ----------------------------
+
+def _hash_segments(video_path: str, provenance_dir: str, first: int, stop: int):
+    """
+    Worker: decode and hash segments [first, stop) and return their roots.
+    Stored leaves are only used to locate the first bad frame; authenticity
+    comes from the recomputed root.
+    """
+    tree = video_merkle.MerkleTree(os.path.join(provenance_dir, "video_merkle.bin"))
+    keyframes = video_index.load_index(os.path.join(provenance_dir, "video_index.bin"))
+    start, _ = tree.segment_range(first)
+    _, end = tree.segment_range(stop - 1)
+    stored = tree.read_nodes(0, start, end)
+
+    # The last worker reads one frame past the signed count to detect appends
+    read_to = end + 1 if stop == tree.segment_count else end
+
+    leaves = []
+    for idx, frame_buf in enumerate(iter_frame_buffers(video_path, start=start, stop=read_to,
+                                                                   keyframes=keyframes), start):
+        if idx == end:
+            return {"roots": None, "mismatch": end, "failure_type": "FRAME_COUNT_MISMATCH", "checked": len(leaves)}
+        leaf = video_merkle.leaf_hash(frame_buf)
+        if leaf != stored[idx - start]:
+            return {"roots": None, "mismatch": idx, "failure_type": "FRAME_HASH_MISMATCH", "checked": len(leaves) + 1}
+        leaves.append(leaf)
+
+    if len(leaves) < end - start:
+        return {"roots": None, "mismatch": start + len(leaves), "failure_type": "FRAME_COUNT_MISMATCH", "checked": len(leaves)}
+
+    size = tree.segment_size
+    roots = [video_merkle.subtree_root(leaves[i:i + size]) for i in range(0, len(leaves), size)]
+    return {"roots": roots, "mismatch": None, "failure_type": None, "checked": len(leaves)}
+
+
+def verify_video_merkle(video_path: str, public_key, frames=None, workers=None,
+                        provenance_dir: str = PROVENANCE_DIR):
+    tree = video_merkle.MerkleTree(os.path.join(provenance_dir, "video_merkle.bin"))
+
+    report = {
+        "file": video_path,
+        "status": "UNKNOWN",
+        "format": "merkle",
+        "failure_type": None,
+        "first_mismatched_frame": None,
+        "total_frames_checked": 0,
+        "signed_frame_count": tree.frame_count,
+        "signed_by": "ECDSA-P256",
+        "verified_with_public_key": True
+    }
+
+    with open(os.path.join(provenance_dir, "video_merkle_sig.bin"), "rb") as f:
+        signature = f.read()
+
+    if frames is not None:
+        start, stop = frames
+        if not 0 <= start < stop <= tree.frame_count:
+            raise ValueError(f"Frame range {start}:{stop} is outside the signed 0:{tree.frame_count}")
+        report["frame_range"] = [start, stop]
+        keyframes = video_index.load_index(os.path.join(provenance_dir, "video_index.bin"))
+
+        stored = tree.read_nodes(0, start, stop)
+        leaves = []
+        failure_type = "FRAME_COUNT_MISMATCH"  # unless a frame differs, the video ended early
+        for idx, frame_buf in enumerate(iter_frame_buffers(video_path, start=start, stop=stop,
+                                                                       keyframes=keyframes), start):
+            report["total_frames_checked"] += 1
+            leaf = video_merkle.leaf_hash(frame_buf)
+            if leaf != stored[idx - start]:
+                failure_type = "FRAME_HASH_MISMATCH"
+                break
+            leaves.append(leaf)
+
+        if len(leaves) < stop - start:
+            report["status"] = "FAILED"
+            report["failure_type"] = failure_type
+            report["first_mismatched_frame"] = start + len(leaves)
+            return report
+
+        proof = tree.range_proof(start, stop)
+        report["proof_hashes"] = len(proof)
+        root = tree.root_from_range(start, leaves, proof)
     else:
-        print("✘ Video verification failed")
-        print(f"  Reason: {report['failure_type']}")
-        print(f"  First mismatched frame: {report['first_mismatched_frame']}")
-        save_mismatch_overlay(video_path, report["first_mismatched_frame"])
+        # Contiguous runs of segments per worker: each worker seeks once.
+        # Without a keyframe index workers can't seek, and each would have
+        # to decode from frame 0, so verify in one pass instead
+        workers = min(workers or os.cpu_count() or 1, tree.segment_count)
+        if not os.path.exists(os.path.join(provenance_dir, "video_index.bin")):
+            workers = 1
+        bounds = [tree.segment_count * i // workers for i in range(workers + 1)]
+
+        if workers == 1:
+            results = [_hash_segments(video_path, provenance_dir, 0, tree.segment_count)]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(
+                    _hash_segments,
+                    [video_path] * workers,
+                    [provenance_dir] * workers,
+                    bounds[:-1],
+                    bounds[1:],
+                ))
+
+        report["total_frames_checked"] = sum(r["checked"] for r in results)
+        failed = [r for r in results if r["roots"] is None]
+        if failed:
+            report["status"] = "FAILED"
+            report["failure_type"] = failed[0]["failure_type"]
+            report["first_mismatched_frame"] = failed[0]["mismatch"]
+            return report
+
+        root = tree.root_from_segments([h for r in results for h in r["roots"]])
+
+    try:
+        public_key.verify(
+            signature,
+            video_merkle.signed_digest(tree.frame_count, tree.segment_size, root),
+            ec.ECDSA(hashes.SHA256())
+        )
+        report["status"] = "VERIFIED"
+    except InvalidSignature:
+        report["status"] = "FAILED"
+        report["failure_type"] = "SIGNATURE_MISMATCH"
+        report["first_mismatched_frame"] = frames[0] if frames else 0
 
     return report
 
@@ -128,9 +362,18 @@ def verify_video(video_path: str):
 # CLI entry
 # ----------------------------
 
+def _frame_range(value: str):
+    start, _, stop = value.partition(":")
+    return int(start), int(stop)
+
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python video_verify.py <video.mp4>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Verify a signed video")
+    parser.add_argument("video")
+    parser.add_argument("--frames", type=_frame_range, metavar="START:END",
+                        help="verify only frames [START, END) (Merkle format)")
+    parser.add_argument("--provenance-dir", default=PROVENANCE_DIR,
+                        help="directory holding the video's provenance files")
+    args = parser.parse_args()
 
-    verify_video(sys.argv[1])
\ No newline at end of file
+    verify_video(args.video, args.frames, args.provenance_dir)
\ No newline at end of file